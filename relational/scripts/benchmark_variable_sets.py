@@ -0,0 +1,354 @@
+import contextlib
+import json
+import os
+import re
+import argparse
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOTS_DIR = os.path.join(SCRIPT_DIR, '..', 'generated', 'variable-sets')
+
+MEMORY_UNITS = {
+    'B': 1,
+    'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3,
+    'kB': 1000, 'MB': 1000 ** 2, 'GB': 1000 ** 3,
+}
+
+def parse_memory(value):
+    """Convert a docker stats memory figure such as '12.5MiB' into bytes."""
+    # Streaming docker stats prefixes each refresh with terminal escape codes
+    value = re.sub(r'\x1b\[[0-9;]*[A-Za-z]', '', value)
+    match = re.search(r'([\d.]+)\s*([A-Za-z]+)', value)
+    if not match or match.group(2) not in MEMORY_UNITS:
+        return None
+    return float(match.group(1)) * MEMORY_UNITS[match.group(2)]
+
+def read_bytes(path):
+    """Read a cgroup memory counter, or None if it is unavailable."""
+    try:
+        with open(path, 'r') as file:
+            return int(file.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def find_cgroup_memory_files(container):
+    """Locate the cgroup files holding a container's current and peak memory usage.
+
+    Only works on the Docker host itself (Linux); returns None elsewhere."""
+    result = subprocess.run(
+        ['docker', 'inspect', '--format', '{{.State.Pid}}', container],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+
+    try:
+        with open(f"/proc/{result.stdout.strip()}/cgroup", 'r') as file:
+            lines = file.read().splitlines()
+    except OSError:
+        return None
+
+    for line in lines:
+        _, controllers, path = line.split(':', 2)
+        if controllers == '':
+            # cgroup v2: a single unified hierarchy
+            directory = f"/sys/fs/cgroup{path}"
+            files = (os.path.join(directory, 'memory.current'), os.path.join(directory, 'memory.peak'))
+        elif 'memory' in controllers.split(','):
+            # cgroup v1: the memory controller has its own hierarchy
+            directory = f"/sys/fs/cgroup/memory{path}"
+            files = (os.path.join(directory, 'memory.usage_in_bytes'), os.path.join(directory, 'memory.max_usage_in_bytes'))
+        else:
+            continue
+        if read_bytes(files[0]) is not None:
+            return files
+
+    return None
+
+class MemorySampler:
+    def __init__(self, container: str, interval: float = 0.005):
+        """Track the peak memory usage of a docker container while a case runs.
+
+        On the Docker host the container's cgroup counters are polled every few milliseconds,
+        and its cgroup peak counter is compared before and after the case. Elsewhere this falls
+        back to streaming `docker stats`, which only refreshes about once a second."""
+        self.container = container
+        self.interval = interval
+        self.cgroup_files = find_cgroup_memory_files(container)
+        if not self.cgroup_files:
+            print("Container cgroup is not readable, sampling memory with docker stats (about once a second)")
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = None
+        self._peak_before = None
+
+    def _poll_cgroup(self):
+        current_file, _ = self.cgroup_files
+        while not self._stop.is_set():
+            usage = read_bytes(current_file)
+            if usage is not None:
+                self.peak = max(self.peak, usage)
+            self._stop.wait(self.interval)
+
+    def _read_docker_stats(self):
+        for line in self._process.stdout:
+            usage = parse_memory(line.split('/')[0])
+            if usage is not None:
+                self.peak = max(self.peak, usage)
+
+    def __enter__(self):
+        self.peak = 0
+        self._stop.clear()
+        if self.cgroup_files:
+            self._peak_before = read_bytes(self.cgroup_files[1])
+            self._thread = threading.Thread(target=self._poll_cgroup, daemon=True)
+        else:
+            self._process = subprocess.Popen(
+                ['docker', 'stats', '--format', '{{.MemUsage}}', self.container],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            self._thread = threading.Thread(target=self._read_docker_stats, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._process:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+        self._thread.join()
+
+        if self.cgroup_files:
+            # The peak counter only moves when this case set a new high for the container's lifetime,
+            # in which case it also catches spikes shorter than the polling interval
+            peak_after = read_bytes(self.cgroup_files[1])
+            if peak_after is not None and self._peak_before is not None and peak_after > self._peak_before:
+                self.peak = max(self.peak, peak_after)
+
+def load_cases(snapshots_directory):
+    """Load the generated cases, ordered by predicate and number of variable sets."""
+    query_directory = os.path.join(snapshots_directory, 'query')
+    if not os.path.isdir(query_directory):
+        print(f"Error: '{query_directory}' is not a valid directory, run generate_variable_sets.py first")
+        sys.exit(1)
+
+    cases = []
+    for case_name in os.listdir(query_directory):
+        case_directory = os.path.join(query_directory, case_name)
+        with open(os.path.join(case_directory, 'request.json'), 'r') as file:
+            request = json.load(file)
+        with open(os.path.join(case_directory, 'expected.json'), 'r') as file:
+            expected = json.load(file)
+        cases.append((case_name, request, expected))
+
+    return sorted(cases, key=lambda case: (case[0].rsplit('_', 1)[0], len(case[1]['variables'])))
+
+def measure_overhead(endpoint, repeat):
+    """Estimate the fixed HTTP round trip cost from the median latency of GET /health."""
+    latencies = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        with urllib.request.urlopen(f"{endpoint.rstrip('/')}/health") as response:
+            response.read()
+        latencies.append(time.perf_counter() - start_time)
+    return statistics.median(latencies) * 1000
+
+def fit_latency(rows):
+    """Least-squares fit of median latency against the number of variable sets.
+
+    Returns the cost of each extra variable set and the intercept, both in ms."""
+    sizes = [row['variable_sets'] for row in rows]
+    latencies = [row['median_ms'] for row in rows]
+    if len(set(sizes)) < 2:
+        return None, None
+
+    mean_size = statistics.fmean(sizes)
+    mean_latency = statistics.fmean(latencies)
+    slope = (
+        sum((size - mean_size) * (latency - mean_latency) for size, latency in zip(sizes, latencies))
+        / sum((size - mean_size) ** 2 for size in sizes)
+    )
+    return slope, mean_latency - slope * mean_size
+
+def send_query(endpoint, body):
+    """POST a serialized QueryRequest to the connector and return the parsed response."""
+    request = urllib.request.Request(
+        f"{endpoint.rstrip('/')}/query",
+        data=body,
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+def benchmark_case(endpoint, request, expected, repeat, sampler):
+    """Run a case `repeat` times and return latency, peak memory and correctness."""
+    body = json.dumps(request).encode('utf-8')
+    latencies = []
+    matches = True
+
+    with sampler or contextlib.nullcontext():
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            response = send_query(endpoint, body)
+            latencies.append(time.perf_counter() - start_time)
+            matches = matches and response == expected
+
+    return {
+        'median_ms': statistics.median(latencies) * 1000,
+        'peak_memory_mib': sampler.peak / 1024 ** 2 if sampler else None,
+        'matches': matches,
+    }
+
+def write_csv(results, output_path):
+    """Write the benchmark results as CSV."""
+    def number(value, precision):
+        return '' if value is None else f"{value:.{precision}f}"
+
+    with open(output_path, 'w') as file:
+        file.write(
+            'predicate,variable_sets,median_ms,peak_memory_mib,matches,'
+            'fit_ms_per_set,fit_intercept_ms,loop_ratio\n'
+        )
+        for row in results:
+            file.write(
+                f"{row['predicate']},{row['variable_sets']},{row['median_ms']:.2f},"
+                f"{number(row['peak_memory_mib'], 1)},{row['matches']},"
+                f"{number(row['fit_ms_per_set'], 4)},{number(row['fit_intercept_ms'], 2)},"
+                f"{number(row['loop_ratio'], 3)}\n"
+            )
+    print(f"Results written to {output_path}")
+
+def plot_results(results, output_path):
+    """Chart latency and memory against the number of variable sets."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, skipping chart")
+        return
+
+    figure, (latency_axis, memory_axis) = plt.subplots(1, 2, figsize=(12, 5))
+    for predicate in sorted({row['predicate'] for row in results}):
+        rows = [row for row in results if row['predicate'] == predicate]
+        sizes = [row['variable_sets'] for row in rows]
+        latency_axis.plot(sizes, [row['median_ms'] for row in rows], marker='o', label=predicate)
+        if all(row['peak_memory_mib'] is not None for row in rows):
+            memory_axis.plot(sizes, [row['peak_memory_mib'] for row in rows], marker='o', label=predicate)
+
+    latency_axis.set(xscale='log', yscale='log', xlabel='variable sets', ylabel='median latency (ms)')
+    memory_axis.set(xscale='log', xlabel='variable sets', ylabel='peak connector memory (MiB)')
+    latency_axis.legend()
+    memory_axis.legend()
+    figure.tight_layout()
+    figure.savefig(output_path)
+    print(f"Chart written to {output_path}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark connector latency and memory against the number of variable sets'
+    )
+    parser.add_argument(
+        '--endpoint',
+        default='http://localhost:8081',
+        help='NDC connector endpoint (default: http://localhost:8081)'
+    )
+    parser.add_argument(
+        '--snapshots-dir',
+        default=DEFAULT_SNAPSHOTS_DIR,
+        help='Directory written by generate_variable_sets.py (default: relational/generated/variable-sets)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Number of times each case is sent (default: 5)'
+    )
+    parser.add_argument(
+        '--container',
+        help='Docker container running the connector, used to sample memory usage'
+    )
+    parser.add_argument(
+        '--output',
+        default='variable_sets_benchmark',
+        help='Output path prefix for the CSV and PNG results (default: variable_sets_benchmark)'
+    )
+
+    args = parser.parse_args()
+
+    cases = load_cases(args.snapshots_dir)
+    if not cases:
+        print(f"No cases found in '{args.snapshots_dir}'")
+        sys.exit(1)
+
+    print(f"Found {len(cases)} cases to benchmark")
+
+    overhead_ms = measure_overhead(args.endpoint, args.repeat)
+    print(f"HTTP overhead (median GET /health): {overhead_ms:.2f} ms")
+
+    sampler = MemorySampler(args.container) if args.container else None
+
+    results = []
+    for case_name, request, expected in cases:
+        try:
+            result = benchmark_case(args.endpoint, request, expected, args.repeat, sampler)
+        except Exception as e:
+            print(f"Error running case {case_name}: {str(e)}")
+            sys.exit(1)
+
+        result.update(predicate=case_name.rsplit('_', 1)[0], variable_sets=len(request['variables']))
+        results.append(result)
+
+        memory = '' if result['peak_memory_mib'] is None else f", peak memory {result['peak_memory_mib']:.1f} MiB"
+        status = '✓' if result['matches'] else '❌ response differs from expected'
+        print(f"{case_name}: median {result['median_ms']:.2f} ms{memory} {status}")
+
+    # Batching only matters for correct answers: fit and chart only the cases matching expected
+    mismatched = [row for row in results if not row['matches']]
+    for row in mismatched:
+        row.update(fit_ms_per_set=None, fit_intercept_ms=None, loop_ratio=None)
+
+    print()
+    for predicate in sorted({row['predicate'] for row in results}):
+        rows = [row for row in results if row['predicate'] == predicate and row['matches']]
+        if not rows:
+            print(f"{predicate}: no case matched expected, skipping fit")
+            continue
+        slope, intercept = fit_latency(rows)
+
+        # A looping connector pays roughly one single-set query for every extra variable set,
+        # so compare the fitted per-set cost with the single-set latency minus the HTTP overhead
+        loop_ratio = None
+        smallest = min(rows, key=lambda row: row['variable_sets'])
+        if slope is not None and smallest['variable_sets'] == 1 and smallest['median_ms'] > overhead_ms:
+            loop_ratio = slope / (smallest['median_ms'] - overhead_ms)
+
+        for row in rows:
+            row.update(fit_ms_per_set=slope, fit_intercept_ms=intercept, loop_ratio=loop_ratio)
+
+        if slope is None:
+            print(f"{predicate}: need at least two sizes to fit latency")
+            continue
+        ratio = '' if loop_ratio is None else f", loop ratio {loop_ratio:.3f}"
+        print(f"{predicate}: {slope:.4f} ms per extra variable set, intercept {intercept:.2f} ms{ratio}")
+
+    write_csv(results, f"{args.output}.csv")
+    plot_results([row for row in results if row['matches']], f"{args.output}.png")
+
+    if mismatched:
+        print(f"Error: {len(mismatched)} cases returned a response differing from expected")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
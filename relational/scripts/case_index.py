@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import shutil
+import argparse
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOTS_DIR = os.path.join(SCRIPT_DIR, '..')
+DEFAULT_INDEX_PATH = os.path.join(SCRIPT_DIR, '..', 'generated', 'case-index.json')
+
+FEATURES = [
+    'collections', 'relationships', 'operators', 'aggregate_functions', 'order_by_targets', 'query_features', 'capabilities'
+]
+
+# Capability paths as reported by a connector's /capabilities endpoint (ndc-spec v0.1)
+CAPABILITIES = [
+    'query.aggregates', 'query.variables', 'relationships',
+    'relationships.relation_comparisons', 'relationships.order_by_aggregate'
+]
+
+# Changes under these paths cannot affect the Postgres replay run by CI. Only list scripts that
+# CI does not run: case_index.py itself decides what CI tests, so changing it must select everything
+IGNORED_PATHS = [
+    'static/relational/mssql/',
+    'static/relational/databricks/',
+    'static/relational/embedded/',
+    'relational/scripts/benchmark_variable_sets.py',
+    'relational/scripts/chunk_dataset.py',
+    'relational/scripts/generate_variable_sets.py',
+    'relational/scripts/query_bundle.py',
+    'relational/scripts/replay_cache.py',
+    'README.md',
+    '.gitignore',
+]
+
+def empty_features():
+    """Return an empty feature set for each feature kind."""
+    return {feature: set() for feature in FEATURES}
+
+def collect_path(path, features):
+    """Record the relationships traversed by a column or ordering path."""
+    for element in path:
+        features['relationships'].add(element['relationship'])
+        features['capabilities'].add('relationships')
+        if 'predicate' in element:
+            collect_expression(element['predicate'], features)
+
+def collect_comparison_value(value, features):
+    """Record the features of the right-hand side of a binary comparison."""
+    if value['type'] == 'variable':
+        features['capabilities'].add('query.variables')
+    elif value['type'] == 'column':
+        column = value['column']
+        if column['type'] == 'root_collection_column':
+            features['capabilities'].add('relationships.relation_comparisons')
+        elif column.get('path'):
+            features['capabilities'].add('relationships.relation_comparisons')
+            collect_path(column['path'], features)
+
+def collect_expression(expression, features):
+    """Record the features of a predicate expression."""
+    expression_type = expression['type']
+
+    if expression_type in ('and', 'or'):
+        for child in expression['expressions']:
+            collect_expression(child, features)
+    elif expression_type == 'not':
+        collect_expression(expression['expression'], features)
+    elif expression_type == 'binary_comparison_operator':
+        features['operators'].add(expression['operator'])
+        if expression['column'].get('path'):
+            features['capabilities'].add('relationships.relation_comparisons')
+            collect_path(expression['column']['path'], features)
+        collect_comparison_value(expression['value'], features)
+    elif expression_type == 'unary_comparison_operator':
+        features['operators'].add(expression['operator'])
+        if expression['column'].get('path'):
+            features['capabilities'].add('relationships.relation_comparisons')
+            collect_path(expression['column']['path'], features)
+    elif expression_type == 'exists':
+        in_collection = expression['in_collection']
+        features['query_features'].add(f"exists_{in_collection['type']}")
+        if in_collection['type'] == 'related':
+            features['relationships'].add(in_collection['relationship'])
+        else:
+            features['collections'].add(in_collection['collection'])
+        if 'predicate' in expression:
+            collect_expression(expression['predicate'], features)
+
+def collect_query(query, features):
+    """Record the features of a query and of the relationship queries nested in it."""
+    for field in (query.get('fields') or {}).values():
+        if field['type'] == 'relationship':
+            features['relationships'].add(field['relationship'])
+            features['capabilities'].add('relationships')
+            collect_query(field['query'], features)
+
+    for aggregate in (query.get('aggregates') or {}).values():
+        features['capabilities'].add('query.aggregates')
+        if aggregate['type'] == 'single_column':
+            features['aggregate_functions'].add(aggregate['function'])
+        elif aggregate['type'] == 'column_count' and aggregate.get('distinct'):
+            features['aggregate_functions'].add('column_count_distinct')
+        else:
+            features['aggregate_functions'].add(aggregate['type'])
+
+    if query.get('predicate'):
+        collect_expression(query['predicate'], features)
+
+    for element in (query.get('order_by') or {}).get('elements', []):
+        target = element['target']
+        features['order_by_targets'].add(target['type'])
+        if target['type'] == 'single_column_aggregate':
+            features['aggregate_functions'].add(target['function'])
+        if target['type'] != 'column':
+            features['capabilities'].add('relationships.order_by_aggregate')
+        collect_path(target.get('path', []), features)
+
+    for pagination in ('limit', 'offset'):
+        if query.get(pagination) is not None:
+            features['query_features'].add(pagination)
+
+def extract_features(request):
+    """Return the collections, relationships, operators, aggregate functions, ordering
+    targets, other query features and capabilities exercised by a QueryRequest."""
+    features = empty_features()
+    features['collections'].add(request['collection'])
+
+    relationships = request.get('collection_relationships') or {}
+    for relationship in relationships.values():
+        features['collections'].add(relationship['target_collection'])
+    features['relationships'].update(relationships)
+
+    if request.get('variables') is not None:
+        features['capabilities'].add('query.variables')
+
+    collect_query(request['query'], features)
+    return {feature: sorted(values) for feature, values in features.items()}
+
+def load_index(index_path):
+    """Load a case-to-feature index written by build_index, or return an empty one if there is none."""
+    if not os.path.isfile(index_path):
+        return {}
+
+    try:
+        with open(index_path, 'r') as file:
+            return json.load(file)['cases']
+    except (json.JSONDecodeError, KeyError):
+        print(f"Ignoring unreadable index '{index_path}'")
+        return {}
+
+def build_index(snapshots_directory, index_path, previous=None):
+    """Parse the request.json files and write the case-to-feature index.
+
+    Entries of `previous` whose `request_sha256` still matches the request are reused
+    instead of being parsed again."""
+    query_directory = os.path.join(snapshots_directory, 'query')
+    if not os.path.isdir(query_directory):
+        print(f"Error: '{query_directory}' is not a valid directory")
+        sys.exit(1)
+
+    previous = previous or {}
+    cases = {}
+    reused = 0
+    for case_name in sorted(os.listdir(query_directory)):
+        request_path = os.path.join(query_directory, case_name, 'request.json')
+        if not os.path.isfile(request_path):
+            continue
+
+        with open(request_path, 'rb') as file:
+            raw = file.read()
+        request_sha256 = hashlib.sha256(raw).hexdigest()
+
+        if case_name in previous and previous[case_name].get('request_sha256') == request_sha256:
+            cases[case_name] = previous[case_name]
+            reused += 1
+            continue
+
+        try:
+            entry = extract_features(json.loads(raw))
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"Error indexing case {case_name}: {str(e)}")
+            sys.exit(1)
+
+        entry['request_sha256'] = request_sha256
+        cases[case_name] = entry
+
+    if cases != previous:
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        with open(index_path, 'w') as file:
+            json.dump({'cases': cases}, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+    print(f"Indexed {len(cases)} cases into {index_path} ({reused} unchanged)")
+    return cases
+
+def select_for_changed_files(cases, changed_files):
+    """Select the cases affected by a list of changed repository paths."""
+    selected = set()
+    for path in changed_files:
+        path = path.strip().replace(os.sep, '/')
+        if not path:
+            continue
+
+        parts = path.split('/')
+        if path.startswith('relational/query/') and len(parts) > 3:
+            if parts[2] in cases:
+                selected.add(parts[2])
+        elif any(path.startswith(prefix) for prefix in IGNORED_PATHS):
+            continue
+        else:
+            # Dataset, loader, connector and workflow changes (and anything unrecognised) may affect
+            # every case; dataset edits in particular must reach the load step, which checks them
+            return set(cases)
+
+    return selected
+
+def select_for_features(cases, filters):
+    """Select the cases exercising any of the requested feature values."""
+    return {
+        name for name, entry in cases.items()
+        if any(set(values) & set(entry[feature]) for feature, values in filters.items())
+    }
+
+def write_selection(snapshots_directory, case_names, output_directory):
+    """Copy the selected cases into a snapshots directory for ndc-test replay."""
+    for case_name in case_names:
+        shutil.copytree(
+            os.path.join(snapshots_directory, 'query', case_name),
+            os.path.join(output_directory, 'query', case_name),
+            dirs_exist_ok=True
+        )
+    print(f"Copied {len(case_names)} cases into {output_directory}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Index which features each query case exercises and select the cases affected by a change'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('build', help='Rebuild the case-to-feature index from scratch')
+
+    select_parser = subparsers.add_parser('select', help='Select the cases affected by a change')
+    select_parser.add_argument(
+        '--changed-files',
+        help="File listing changed paths, one per line (e.g. from 'git diff --name-only'), or - for stdin"
+    )
+    select_parser.add_argument('--collection', nargs='+', default=[], help='Collections to select')
+    select_parser.add_argument('--relationship', nargs='+', default=[], help='Relationships to select')
+    select_parser.add_argument('--operator', nargs='+', default=[], help='Comparison operators to select')
+    select_parser.add_argument('--aggregate-function', nargs='+', default=[], help='Aggregate functions to select')
+    select_parser.add_argument('--order-by-target', nargs='+', default=[], help='Ordering target types to select')
+    select_parser.add_argument(
+        '--query-feature',
+        nargs='+',
+        default=[],
+        choices=['exists_related', 'exists_unrelated', 'limit', 'offset'],
+        help='Other query features to select'
+    )
+    select_parser.add_argument(
+        '--capability',
+        nargs='+',
+        default=[],
+        choices=CAPABILITIES,
+        help='Connector capabilities to select'
+    )
+    select_parser.add_argument(
+        '--output-dir',
+        help='Copy the selected cases into this snapshots directory'
+    )
+
+    parser.add_argument(
+        '--snapshots-dir',
+        default=DEFAULT_SNAPSHOTS_DIR,
+        help='Snapshots directory containing query/*/ (default: relational)'
+    )
+    parser.add_argument(
+        '--index',
+        default=DEFAULT_INDEX_PATH,
+        help='Index path (default: relational/generated/case-index.json)'
+    )
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_index(args.snapshots_dir, args.index)
+        return
+
+    # Select from the stored index, re-parsing only the requests whose hash no longer matches
+    cases = build_index(args.snapshots_dir, args.index, load_index(args.index))
+
+    filters = {
+        'collections': args.collection,
+        'relationships': args.relationship,
+        'operators': args.operator,
+        'aggregate_functions': args.aggregate_function,
+        'order_by_targets': args.order_by_target,
+        'query_features': args.query_feature,
+        'capabilities': args.capability,
+    }
+    filters = {feature: values for feature, values in filters.items() if values}
+
+    if not filters and not args.changed_files:
+        parser.error("Provide --changed-files or at least one feature filter")
+
+    selected = select_for_features(cases, filters)
+    if args.changed_files:
+        if args.changed_files == '-':
+            changed_files = sys.stdin.read().splitlines()
+        else:
+            with open(args.changed_files, 'r') as file:
+                changed_files = file.read().splitlines()
+        selected |= select_for_changed_files(cases, changed_files)
+
+    selected = sorted(selected)
+    for case_name in selected:
+        print(case_name)
+    print(f"Selected {len(selected)} of {len(cases)} cases")
+
+    if args.output_dir:
+        write_selection(args.snapshots_dir, selected, args.output_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+import argparse
+import sys
+from chunked_dataset import MANIFEST_COMPRESSIONS, MANIFEST_NAME, MANIFEST_VERSION
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATASET_DIR = os.path.join(SCRIPT_DIR, '..', 'dataset')
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, '..', 'generated', 'dataset-ndjson')
+
+def compressor_for(compression, level):
+    """Return a function compressing one chunk with the requested codec."""
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            print("Error: zstandard is not installed, run 'pip install zstandard' or use --compression gzip")
+            sys.exit(1)
+        compressor = zstandard.ZstdCompressor(level=level)
+        return compressor.compress
+
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+def chunk_table(file_path, output_path, chunk_rows, compress):
+    """Rewrite one JSON array file as compressed NDJSON chunks and return their manifest entries."""
+    with open(file_path, 'r') as file:
+        json_data = json.load(file)
+
+    # Handle both single objects and arrays of objects
+    if isinstance(json_data, dict):
+        json_data = [json_data]
+
+    chunks = []
+    with open(output_path, 'wb') as output:
+        for start in range(0, len(json_data), chunk_rows):
+            rows = json_data[start:start + chunk_rows]
+            lines = ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+            # Each chunk is its own gzip member or zstd frame: the file as a whole stays valid,
+            # while the manifest offsets let chunked_dataset.py decode chunks independently
+            blob = compress(lines.encode('utf-8'))
+            chunks.append({'offset': output.tell(), 'length': len(blob), 'rows': len(rows)})
+            output.write(blob)
+
+    return len(json_data), chunks
+
+def chunk_dataset(dataset_directory, output_directory, chunk_rows, compression, level):
+    """Convert every table of the dataset and write the manifest describing the chunks."""
+    json_files = sorted([f for f in os.listdir(dataset_directory) if f.endswith('.json')],
+                        key=lambda x: int(x.split('_')[0]))
+
+    if not json_files:
+        print(f"No JSON files found in '{dataset_directory}'")
+        sys.exit(1)
+
+    os.makedirs(output_directory, exist_ok=True)
+    compress = compressor_for(compression, level)
+    extension = 'zst' if compression == 'zstd' else 'gz'
+
+    tables = []
+    for filename in json_files:
+        path = f"{os.path.splitext(filename)[0]}.ndjson.{extension}"
+        try:
+            rows, chunks = chunk_table(
+                os.path.join(dataset_directory, filename),
+                os.path.join(output_directory, path),
+                chunk_rows,
+                compress
+            )
+        except json.JSONDecodeError as e:
+            print(f"Error reading JSON file {filename}: {str(e)}")
+            sys.exit(1)
+
+        tables.append({'source': filename, 'path': path, 'rows': rows, 'chunks': chunks})
+        print(f"Converted {filename}: {rows} rows in {len(chunks)} chunks")
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'format': 'ndjson',
+        'compression': compression,
+        'tables': tables,
+    }
+    with open(os.path.join(output_directory, MANIFEST_NAME), 'w') as file:
+        json.dump(manifest, file, indent=2)
+        file.write('\n')
+
+    print(f"Wrote manifest for {len(tables)} tables to {output_directory}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert the dataset into compressed NDJSON split into independently decodable chunks'
+    )
+    parser.add_argument(
+        '--dataset',
+        default=DEFAULT_DATASET_DIR,
+        help='Directory containing the dataset JSON files (default: relational/dataset)'
+    )
+    parser.add_argument(
+        '--output',
+        default=DEFAULT_OUTPUT_DIR,
+        help='Directory to write the chunks and manifest.json into (default: relational/generated/dataset-ndjson)'
+    )
+    parser.add_argument(
+        '--chunk-rows',
+        type=int,
+        default=1000,
+        help='Rows per chunk (default: 1000)'
+    )
+    parser.add_argument(
+        '--compression',
+        choices=MANIFEST_COMPRESSIONS,
+        default='gzip',
+        help='Chunk compression; zstd requires the zstandard package (default: gzip)'
+    )
+    parser.add_argument(
+        '--level',
+        type=int,
+        default=6,
+        help='Compression level (default: 6)'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dataset):
+        print(f"Error: '{args.dataset}' is not a valid directory")
+        sys.exit(1)
+
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be a positive integer")
+
+    chunk_dataset(args.dataset, args.output, args.chunk_rows, args.compression, args.level)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import gzip
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Reader side of the chunked NDJSON format written by chunk_dataset.py, shared by the loaders
+# under static/relational/. Each loader only supplies the callback inserting a chunk of rows
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+MANIFEST_FORMATS = ['ndjson']
+MANIFEST_COMPRESSIONS = ['gzip', 'zstd']
+
+def read_manifest(json_directory):
+    """Return the chunked dataset manifest in a directory, or None for a plain JSON dataset."""
+    manifest_path = os.path.join(json_directory, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        return None
+
+    with open(manifest_path, 'r') as file:
+        manifest = json.load(file)
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        print(f"Error: Unsupported manifest version {manifest.get('version')} in '{manifest_path}'")
+        sys.exit(1)
+    if manifest.get('format') not in MANIFEST_FORMATS:
+        print(f"Error: Unsupported chunk format {manifest.get('format')} in '{manifest_path}'")
+        sys.exit(1)
+    if manifest.get('compression') not in MANIFEST_COMPRESSIONS:
+        print(f"Error: Unsupported chunk compression {manifest.get('compression')} in '{manifest_path}'")
+        sys.exit(1)
+    return manifest
+
+def decode_chunk(file_path, offset, length, compression):
+    """Decode one independently compressed NDJSON chunk into a list of rows."""
+    with open(file_path, 'rb') as file:
+        file.seek(offset)
+        data = file.read(length)
+
+    if compression == 'zstd':
+        import zstandard
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif compression == 'gzip':
+        data = gzip.decompress(data)
+    else:
+        raise ValueError(f"Unsupported chunk compression {compression}")
+
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+def process_chunked_files(json_directory, manifest, insert_rows, table_loaded=None, workers=None):
+    """Parse the chunks listed in a manifest in a process pool, inserting each chunk
+    in manifest order while the following chunks are still being parsed.
+
+    `insert_rows(rows, source)` receives each chunk along with the table's original file name,
+    e.g. 005_Track.json. `table_loaded(source, rows)`, if given, is called after the last
+    chunk of each table with the row count listed in the manifest."""
+    print(f"Found {len(manifest['tables'])} chunked NDJSON tables to process")
+
+    chunks = iter([(table, chunk) for table in manifest['tables'] for chunk in table['chunks']])
+    workers = workers or os.cpu_count() or 1
+
+    def submit(pool, table, chunk):
+        file_path = os.path.join(json_directory, table['path'])
+        future = pool.submit(decode_chunk, file_path, chunk['offset'], chunk['length'], manifest['compression'])
+        return table, chunk, future
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded window of chunks in flight so parsing runs ahead of the inserts
+        # without holding the whole dataset in memory
+        pending = deque(submit(pool, table, chunk) for table, chunk in itertools.islice(chunks, workers * 2))
+
+        while pending:
+            table, chunk, future = pending.popleft()
+            next_chunk = next(chunks, None)
+            if next_chunk:
+                pending.append(submit(pool, *next_chunk))
+
+            try:
+                rows = future.result()
+            except Exception as e:
+                print(f"Error reading chunk at offset {chunk['offset']} of {table['path']}: {str(e)}")
+                sys.exit(1)
+
+            if len(rows) != chunk['rows']:
+                print(f"Error: Chunk at offset {chunk['offset']} of {table['path']} has {len(rows)} rows, expected {chunk['rows']}")
+                sys.exit(1)
+
+            insert_rows(rows, table['source'])
+
+            if table_loaded and chunk is table['chunks'][-1]:
+                table_loaded(table['source'], table['rows'])
+
+    # Tables without rows have no chunks, so they never reach the loop above
+    if table_loaded:
+        for table in manifest['tables']:
+            if not table['chunks']:
+                table_loaded(table['source'], table['rows'])
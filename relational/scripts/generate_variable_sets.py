@@ -0,0 +1,208 @@
+import json
+import os
+import random
+import re
+import argparse
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATASET_DIR = os.path.join(SCRIPT_DIR, '..', 'dataset')
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, '..', 'generated', 'variable-sets')
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000]
+
+def load_table(dataset_directory, table_name):
+    """Load the rows of a single table from the dataset directory."""
+    for filename in os.listdir(dataset_directory):
+        if not filename.endswith('.json') or '_' not in filename:
+            continue
+        if os.path.splitext(filename.split('_', 1)[1])[0] == table_name:
+            with open(os.path.join(dataset_directory, filename), 'r') as file:
+                return json.load(file)
+
+    print(f"Error: Table '{table_name}' not found in '{dataset_directory}'")
+    sys.exit(1)
+
+def like_to_regex(pattern):
+    """Translate a SQL LIKE pattern into a compiled regular expression."""
+    parts = []
+    for char in pattern:
+        if char == '%':
+            parts.append('.*')
+        elif char == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.DOTALL)
+
+def like_search_values(albums, rng, count):
+    """Pick `_like` search patterns, mixing substring, exact and non-matching values."""
+    words = sorted({word for album in albums for word in album['Title'].split() if len(word) > 2})
+    titles = [album['Title'] for album in albums]
+
+    values = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.7:
+            values.append(f"%{rng.choice(words)}%")
+        elif roll < 0.9:
+            values.append(rng.choice(titles))
+        else:
+            values.append(f"%no-such-title-{rng.randint(0, 9999)}%")
+    return values
+
+def eq_id_values(albums, rng, count):
+    """Pick `_eq` ids, mixing existing ids, missing ids and nulls."""
+    max_id = max(album['AlbumId'] for album in albums)
+
+    values = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.8:
+            values.append(rng.randint(1, max_id))
+        elif roll < 0.9:
+            values.append(rng.randint(max_id + 1, max_id * 2))
+        else:
+            values.append(None)
+    return values
+
+def expected_like_rows(albums, search):
+    """Compute the rows returned for `Title _like search`, ordered by AlbumId."""
+    regex = like_to_regex(search)
+    matches = sorted(
+        (album for album in albums if regex.fullmatch(album['Title'])),
+        key=lambda album: album['AlbumId']
+    )
+    return [{'Title': album['Title']} for album in matches]
+
+def expected_eq_rows(albums, album_id):
+    """Compute the rows returned for `AlbumId _eq id`; a null id matches nothing."""
+    if album_id is None:
+        return []
+    return [
+        {'AlbumId': album['AlbumId'], 'Title': album['Title']}
+        for album in albums if album['AlbumId'] == album_id
+    ]
+
+def like_request(variables):
+    """Build the request used by select_where_variable for the given variable sets."""
+    return {
+        'collection': 'Album',
+        'query': {
+            'fields': {
+                'Title': {'type': 'column', 'column': 'Title', 'arguments': {}}
+            },
+            'predicate': {
+                'type': 'binary_comparison_operator',
+                'column': {'type': 'column', 'name': 'Title', 'path': []},
+                'operator': '_like',
+                'value': {'type': 'variable', 'name': 'search'}
+            },
+            'order_by': {
+                'elements': [
+                    {
+                        'order_direction': 'asc',
+                        'target': {'type': 'column', 'name': 'AlbumId', 'path': []}
+                    }
+                ]
+            }
+        },
+        'arguments': {},
+        'collection_relationships': {},
+        'variables': [{'search': value} for value in variables]
+    }
+
+def eq_request(variables):
+    """Build the request used by select_where_variable_int_with_null_variable_value."""
+    return {
+        'collection': 'Album',
+        'query': {
+            'fields': {
+                'AlbumId': {'type': 'column', 'column': 'AlbumId', 'arguments': {}},
+                'Title': {'type': 'column', 'column': 'Title', 'arguments': {}}
+            },
+            'predicate': {
+                'type': 'binary_comparison_operator',
+                'column': {'type': 'column', 'name': 'AlbumId', 'path': []},
+                'operator': '_eq',
+                'value': {'type': 'variable', 'name': 'id'}
+            }
+        },
+        'arguments': {},
+        'collection_relationships': {},
+        'variables': [{'id': value} for value in variables]
+    }
+
+PREDICATES = {
+    'like': (like_search_values, like_request, expected_like_rows),
+    'eq': (eq_id_values, eq_request, expected_eq_rows),
+}
+
+def write_case(output_directory, case_name, request, expected):
+    """Write a request/expected pair in the snapshot layout used by ndc-test."""
+    case_directory = os.path.join(output_directory, 'query', case_name)
+    os.makedirs(case_directory, exist_ok=True)
+
+    with open(os.path.join(case_directory, 'request.json'), 'w') as file:
+        json.dump(request, file, indent=2)
+        file.write('\n')
+    with open(os.path.join(case_directory, 'expected.json'), 'w') as file:
+        json.dump(expected, file, indent=2)
+        file.write('\n')
+
+def generate_cases(dataset_directory, output_directory, sizes, seed):
+    """Generate one case per predicate and variable-set count."""
+    albums = load_table(dataset_directory, 'Album')
+
+    for predicate, (pick_values, build_request, expected_rows) in PREDICATES.items():
+        for size in sizes:
+            # Seed per case so a given size is stable regardless of the other sizes requested
+            rng = random.Random(f"{seed}-{predicate}-{size}")
+            values = pick_values(albums, rng, size)
+
+            request = build_request(values)
+            expected = [{'rows': expected_rows(albums, value)} for value in values]
+
+            case_name = f"select_where_variable_{predicate}_{size}"
+            write_case(output_directory, case_name, request, expected)
+            print(f"Generated {case_name} ({size} variable sets)")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate variable-set (foreach) stress cases from the relational dataset'
+    )
+    parser.add_argument(
+        '--dataset',
+        default=DEFAULT_DATASET_DIR,
+        help='Directory containing the dataset JSON files (default: relational/dataset)'
+    )
+    parser.add_argument(
+        '--output',
+        default=DEFAULT_OUTPUT_DIR,
+        help='Snapshots directory to write into (default: relational/generated/variable-sets)'
+    )
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=DEFAULT_SIZES,
+        help='Numbers of variable sets to generate (default: 1 10 100 1000 10000)'
+    )
+    parser.add_argument(
+        '--seed',
+        default='ndc-test-cases',
+        help='Seed for choosing variable values (default: ndc-test-cases)'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dataset):
+        print(f"Error: '{args.dataset}' is not a valid directory")
+        sys.exit(1)
+
+    if any(size < 1 for size in args.sizes):
+        parser.error("Sizes must be positive integers")
+
+    generate_cases(args.dataset, args.output, args.sizes, args.seed)
+
+if __name__ == "__main__":
+    main()
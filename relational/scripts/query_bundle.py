@@ -0,0 +1,253 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+import argparse
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOTS_DIR = os.path.join(SCRIPT_DIR, '..')
+DEFAULT_BUNDLE_PATH = os.path.join(SCRIPT_DIR, '..', 'generated', 'query-bundle.bin')
+
+# Layout: header | compressed request/expected blobs | JSON index
+# The header stores where the index lives so readers only touch the blobs they select
+MAGIC = b'NDCB'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQ')
+
+def list_cases(snapshots_directory):
+    """Return the sorted names of the cases under `<snapshots_directory>/query`."""
+    query_directory = os.path.join(snapshots_directory, 'query')
+    if not os.path.isdir(query_directory):
+        print(f"Error: '{query_directory}' is not a valid directory")
+        sys.exit(1)
+
+    return sorted(
+        name for name in os.listdir(query_directory)
+        if os.path.isfile(os.path.join(query_directory, name, 'request.json'))
+    )
+
+def build_bundle(snapshots_directory, bundle_path, level=9):
+    """Pack every request/expected pair into a single indexed bundle file."""
+    case_names = list_cases(snapshots_directory)
+    if not case_names:
+        print(f"No cases found in '{snapshots_directory}'")
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(os.path.abspath(bundle_path)), exist_ok=True)
+    temporary_path = f"{bundle_path}.tmp"
+
+    index = {}
+    with open(temporary_path, 'wb') as bundle:
+        bundle.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+
+        for case_name in case_names:
+            case_directory = os.path.join(snapshots_directory, 'query', case_name)
+            entry = {}
+            for kind in ('request', 'expected'):
+                with open(os.path.join(case_directory, f"{kind}.json"), 'rb') as file:
+                    raw = file.read()
+                blob = zlib.compress(raw, level)
+                entry[kind] = [bundle.tell(), len(blob), len(raw)]
+                entry[f"{kind}_sha256"] = hashlib.sha256(raw).hexdigest()
+                bundle.write(blob)
+            index[case_name] = entry
+
+        index_offset = bundle.tell()
+        index_bytes = json.dumps({'cases': index}, sort_keys=True).encode('utf-8')
+        bundle.write(index_bytes)
+
+        bundle.seek(0)
+        bundle.write(HEADER.pack(MAGIC, VERSION, index_offset, len(index_bytes)))
+
+    # Replace atomically so readers never see a half-written bundle
+    os.replace(temporary_path, bundle_path)
+    print(f"Bundled {len(case_names)} cases into {bundle_path} ({os.path.getsize(bundle_path)} bytes)")
+
+class QueryBundle:
+    def __init__(self, bundle_path: str):
+        """Open a bundle and read its index; blobs are decoded on demand."""
+        self.path = bundle_path
+        self._file = open(bundle_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{bundle_path}' is not a query bundle")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported query bundle version {version} in '{bundle_path}'")
+
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self.index = index['cases']
+
+    def close(self):
+        """Release the memory map and the underlying file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, case_name):
+        return case_name in self.index
+
+    def cases(self):
+        """Return the sorted case names stored in the bundle."""
+        return sorted(self.index)
+
+    def raw(self, case_name, kind):
+        """Return the original bytes of a case's `request` or `expected` file."""
+        offset, length, raw_length = self.index[case_name][kind]
+        raw = zlib.decompress(self._map[offset:offset + length])
+        if len(raw) != raw_length or hashlib.sha256(raw).hexdigest() != self.sha256(case_name, kind):
+            raise ValueError(f"Corrupt {kind} blob for case '{case_name}' in '{self.path}'")
+        return raw
+
+    def request(self, case_name):
+        """Decode the request of a single case."""
+        return json.loads(self.raw(case_name, 'request'))
+
+    def expected(self, case_name):
+        """Decode the expected response of a single case."""
+        return json.loads(self.raw(case_name, 'expected'))
+
+    def sha256(self, case_name, kind):
+        """Return the hash of a case's original `request` or `expected` file."""
+        return self.index[case_name][f"{kind}_sha256"]
+
+    def stale_cases(self, snapshots_directory, case_names=None):
+        """Return the cases whose files under `<snapshots_directory>/query` no longer match the bundle.
+
+        Only the given cases are hashed; without them, cases added to or removed from the
+        snapshots directory since the build are reported as well."""
+        if case_names is None:
+            case_names = sorted(set(self.index) | set(list_cases(snapshots_directory)))
+
+        stale = []
+        for case_name in case_names:
+            case_directory = os.path.join(snapshots_directory, 'query', case_name)
+            for kind in ('request', 'expected'):
+                path = os.path.join(case_directory, f"{kind}.json")
+                if case_name not in self.index or not os.path.isfile(path):
+                    stale.append(case_name)
+                    break
+                with open(path, 'rb') as file:
+                    if hashlib.sha256(file.read()).hexdigest() != self.sha256(case_name, kind):
+                        stale.append(case_name)
+                        break
+        return stale
+
+def extract_cases(bundle, case_names, output_directory):
+    """Write the selected cases back out in the snapshot layout used by ndc-test."""
+    for case_name in case_names:
+        case_directory = os.path.join(output_directory, 'query', case_name)
+        os.makedirs(case_directory, exist_ok=True)
+        for kind in ('request', 'expected'):
+            with open(os.path.join(case_directory, f"{kind}.json"), 'wb') as file:
+                file.write(bundle.raw(case_name, kind))
+
+    print(f"Extracted {len(case_names)} cases into {output_directory}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pack the query snapshots into a single indexed bundle, or read cases from one'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # Options shared by every command, so they can follow the command name
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument(
+        '--bundle',
+        default=DEFAULT_BUNDLE_PATH,
+        help='Bundle path (default: relational/generated/query-bundle.bin)'
+    )
+    common_parser.add_argument(
+        '--snapshots-dir',
+        default=DEFAULT_SNAPSHOTS_DIR,
+        help='Snapshots directory containing query/*/ (default: relational)'
+    )
+
+    # Options shared by the commands reading a bundle
+    read_parser = argparse.ArgumentParser(add_help=False, parents=[common_parser])
+    read_parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Fail if the bundle no longer matches the snapshots directory for the cases read'
+    )
+
+    build_parser = subparsers.add_parser(
+        'build', parents=[common_parser], help='Build a bundle from a snapshots directory'
+    )
+    build_parser.add_argument(
+        '--level',
+        type=int,
+        default=9,
+        help='zlib compression level (default: 9)'
+    )
+
+    subparsers.add_parser('list', parents=[read_parser], help='List the cases stored in a bundle')
+
+    show_parser = subparsers.add_parser(
+        'show', parents=[read_parser], help='Print the request or expected response of a case'
+    )
+    show_parser.add_argument('case', help='Case name')
+    show_parser.add_argument(
+        '--kind',
+        choices=['request', 'expected'],
+        default='request',
+        help='Which file to print (default: request)'
+    )
+
+    extract_parser = subparsers.add_parser(
+        'extract', parents=[read_parser], help='Write selected cases out as a snapshots directory'
+    )
+    extract_parser.add_argument('cases', nargs='*', help='Case names (default: all cases)')
+    extract_parser.add_argument(
+        '--output',
+        required=True,
+        help='Snapshots directory to write into'
+    )
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_bundle(args.snapshots_dir, args.bundle, args.level)
+        return
+
+    if not os.path.isfile(args.bundle):
+        print(f"Error: Bundle '{args.bundle}' does not exist, run the build command first")
+        sys.exit(1)
+
+    with QueryBundle(args.bundle) as bundle:
+        if args.command == 'list':
+            selected = None
+        else:
+            selected = [args.case] if args.command == 'show' else args.cases or bundle.cases()
+            missing = [case_name for case_name in selected if case_name not in bundle]
+            if missing:
+                print(f"Error: Cases not found in '{args.bundle}': {', '.join(missing)}")
+                sys.exit(1)
+
+        if args.check:
+            stale = bundle.stale_cases(args.snapshots_dir, selected)
+            if stale:
+                print(f"Error: Bundle '{args.bundle}' is out of date for: {', '.join(stale)}, rerun the build command")
+                sys.exit(1)
+
+        if args.command == 'list':
+            for case_name in bundle.cases():
+                print(case_name)
+        elif args.command == 'show':
+            sys.stdout.write(bundle.raw(args.case, args.kind).decode('utf-8'))
+        else:
+            extract_cases(bundle, selected, args.output)
+
+if __name__ == "__main__":
+    main()
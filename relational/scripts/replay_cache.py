@@ -0,0 +1,285 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+import argparse
+import sys
+import urllib.error
+import urllib.request
+from query_bundle import QueryBundle, list_cases
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOTS_DIR = os.path.join(SCRIPT_DIR, '..')
+DEFAULT_DATASET_DIR = os.path.join(SCRIPT_DIR, '..', 'dataset')
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, '..', 'generated', 'replay-cache')
+
+def hash_paths(paths):
+    """Hash the names and contents of files, walking directories in sorted order."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        if os.path.isdir(path):
+            base = path
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+            )
+        else:
+            base = os.path.dirname(path)
+            files = [path]
+
+        for file_path in files:
+            digest.update(os.path.relpath(file_path, base).encode('utf-8'))
+            digest.update(b'\0')
+            with open(file_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    digest.update(chunk)
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+def environment_hash(dataset_directory, connector, connector_version, configuration_paths, schema_bytes):
+    """Hash everything outside the case itself that can change a replay result.
+
+    The connector name and the /schema response it serves keep passes recorded against one
+    backend from being reused for another backend reporting the same version."""
+    digest = hashlib.sha256()
+    digest.update(f"dataset:{hash_paths([dataset_directory])}\n".encode('utf-8'))
+    digest.update(f"connector:{connector}@{connector_version}\n".encode('utf-8'))
+    digest.update(f"configuration:{hash_paths(configuration_paths)}\n".encode('utf-8'))
+    digest.update(f"schema:{hashlib.sha256(schema_bytes).hexdigest()}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def case_key(request_bytes, expected_bytes, environment):
+    """Build the cache key of a case for a given dataset and connector build."""
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(request_bytes).digest())
+    digest.update(hashlib.sha256(expected_bytes).digest())
+    digest.update(environment.encode('utf-8'))
+    return digest.hexdigest()
+
+class ReplayCache:
+    def __init__(self, cache_directory: str, max_entries: int, max_size: int):
+        """Store one gzip-compressed verified response per key, evicting least recently used entries."""
+        self.cache_directory = cache_directory
+        self.max_entries = max_entries
+        self.max_size = max_size
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_directory, f"{key}.json.gz")
+
+    def hit(self, key):
+        """Return whether a verified pass is cached for this key, marking it as recently used."""
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return False
+        os.utime(path)
+        return True
+
+    def store(self, key, response_bytes):
+        """Record a verified pass along with the response that passed."""
+        path = self._path(key)
+        temporary_path = f"{path}.tmp"
+        with gzip.open(temporary_path, 'wb') as file:
+            file.write(response_bytes)
+        os.replace(temporary_path, path)
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits its limits."""
+        entries = []
+        for name in os.listdir(self.cache_directory):
+            if not name.endswith('.json.gz'):
+                continue
+            stat = os.stat(os.path.join(self.cache_directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        entries.sort(reverse=True)
+        total_size = sum(size for _, size, _ in entries)
+        evicted = 0
+        while entries and (len(entries) > self.max_entries or total_size > self.max_size):
+            _, size, name = entries.pop()
+            os.remove(os.path.join(self.cache_directory, name))
+            total_size -= size
+            evicted += 1
+        return evicted
+
+def fetch_schema(endpoint):
+    """GET the connector's /schema response, which differs between backends and configurations."""
+    try:
+        with urllib.request.urlopen(f"{endpoint.rstrip('/')}/schema") as response:
+            return response.read()
+    except urllib.error.URLError as e:
+        print(f"Error: Could not fetch the schema from the connector at {endpoint}: {e.reason}")
+        sys.exit(1)
+
+def send_query(endpoint, body):
+    """POST a serialized QueryRequest to the connector and return the raw response."""
+    request = urllib.request.Request(
+        f"{endpoint.rstrip('/')}/query",
+        data=body,
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+def read_directory_case(snapshots_directory, case_name):
+    """Return the raw request and expected bytes of a case in a snapshots directory."""
+    case_directory = os.path.join(snapshots_directory, 'query', case_name)
+    with open(os.path.join(case_directory, 'request.json'), 'rb') as file:
+        request_bytes = file.read()
+    with open(os.path.join(case_directory, 'expected.json'), 'rb') as file:
+        expected_bytes = file.read()
+    return request_bytes, expected_bytes
+
+def replay(case_names, read_case, endpoint, cache, environment, force=False):
+    """Replay the given cases, skipping those with a cached pass. Returns the failed case names.
+
+    `read_case(case_name)` returns the raw request and expected bytes, so only the
+    replayed cases are read from the snapshots directory or bundle."""
+    print(f"Found {len(case_names)} cases to replay")
+
+    skipped = 0
+    failed = []
+    start_time = time.time()
+    for case_name in case_names:
+        request_bytes, expected_bytes = read_case(case_name)
+        key = case_key(request_bytes, expected_bytes, environment)
+        if not force and cache.hit(key):
+            skipped += 1
+            continue
+
+        try:
+            response_bytes = send_query(endpoint, request_bytes)
+        except urllib.error.HTTPError as e:
+            print(f"❌ {case_name}: connector returned HTTP {e.code}")
+            failed.append(case_name)
+            continue
+        except urllib.error.URLError as e:
+            print(f"Error: Could not reach connector at {endpoint}: {e.reason}")
+            sys.exit(1)
+
+        if json.loads(response_bytes) != json.loads(expected_bytes):
+            print(f"❌ {case_name}: response differs from expected")
+            failed.append(case_name)
+            continue
+
+        cache.store(key, response_bytes)
+        print(f"✓ {case_name}")
+
+    elapsed_time = time.time() - start_time
+    print(
+        f"\n{len(case_names) - skipped} cases replayed, {skipped} skipped with a cached pass, "
+        f"{len(failed)} failed in {elapsed_time:.2f} seconds"
+    )
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay query snapshots against a connector, skipping cases already verified '
+                    'for the same request, dataset, connector build and configuration'
+    )
+    parser.add_argument(
+        '--endpoint',
+        default='http://localhost:8081',
+        help='NDC connector endpoint (default: http://localhost:8081)'
+    )
+    parser.add_argument(
+        '--snapshots-dir',
+        default=DEFAULT_SNAPSHOTS_DIR,
+        help='Snapshots directory containing query/*/ (default: relational)'
+    )
+    parser.add_argument(
+        '--bundle',
+        help='Read the cases from a bundle built by query_bundle.py instead of the snapshots directory'
+    )
+    parser.add_argument(
+        '--cases',
+        nargs='+',
+        help='Case names to replay, e.g. as selected by case_index.py (default: all cases)'
+    )
+    parser.add_argument(
+        '--dataset',
+        default=DEFAULT_DATASET_DIR,
+        help='Dataset directory loaded into the backend (default: relational/dataset)'
+    )
+    parser.add_argument(
+        '--connector',
+        required=True,
+        help='Connector name, e.g. ndc-postgres'
+    )
+    parser.add_argument(
+        '--connector-version',
+        required=True,
+        help='Connector version or image tag, e.g. v1.2.0'
+    )
+    parser.add_argument(
+        '--configuration',
+        nargs='+',
+        required=True,
+        help='Connector configuration files or directories, e.g. static/relational/mssql/ndc-metadata/configuration.json'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help='Cache directory (default: relational/generated/replay-cache)'
+    )
+    parser.add_argument(
+        '--max-entries',
+        type=int,
+        default=10000,
+        help='Maximum number of cached passes (default: 10000)'
+    )
+    parser.add_argument(
+        '--max-size-mb',
+        type=float,
+        default=256,
+        help='Maximum cache size in MB (default: 256)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Replay every case even if a pass is cached'
+    )
+
+    args = parser.parse_args()
+
+    for path in [args.dataset] + args.configuration:
+        if not os.path.exists(path):
+            print(f"Error: '{path}' does not exist")
+            sys.exit(1)
+
+    environment = environment_hash(
+        args.dataset, args.connector, args.connector_version, args.configuration, fetch_schema(args.endpoint)
+    )
+    cache = ReplayCache(args.cache_dir, args.max_entries, int(args.max_size_mb * 1024 * 1024))
+
+    if args.bundle:
+        if not os.path.isfile(args.bundle):
+            print(f"Error: Bundle '{args.bundle}' does not exist, run query_bundle.py build first")
+            sys.exit(1)
+        bundle = QueryBundle(args.bundle)
+        available = bundle.cases()
+        read_case = lambda case_name: (bundle.raw(case_name, 'request'), bundle.raw(case_name, 'expected'))
+    else:
+        available = list_cases(args.snapshots_dir)
+        read_case = lambda case_name: read_directory_case(args.snapshots_dir, case_name)
+
+    case_names = args.cases or available
+    missing = sorted(set(case_names) - set(available))
+    if missing:
+        print(f"Error: Cases not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    failed = replay(case_names, read_case, args.endpoint, cache, environment, args.force)
+
+    evicted = cache.evict()
+    if evicted:
+        print(f"Evicted {evicted} least recently used cache entries")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
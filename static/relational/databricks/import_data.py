@@ -9,6 +9,10 @@ import sys
 import time
 from typing import Optional
 
+# The chunked NDJSON reader is shared with relational/scripts/chunk_dataset.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'relational', 'scripts'))
+from chunked_dataset import read_manifest, process_chunked_files
+
 class DatabricksConnection:
     def __init__(
         self,
@@ -183,7 +187,7 @@ def create_table_from_json(json_data: list, table_name: str, connection: Databri
         print(f"Error creating/populating table {connection.schema}.{table_name}: {str(e)}")
         raise
 
-def process_json_files(json_directory: str, connection: DatabricksConnection):
+def process_json_files(json_directory: str, connection: DatabricksConnection, workers: Optional[int] = None):
     """Process all JSON files in the specified directory."""
     if not os.path.exists(json_directory) or not os.path.isdir(json_directory):
         print(f"Error: '{json_directory}' is not a valid directory")
@@ -195,6 +199,17 @@ def process_json_files(json_directory: str, connection: DatabricksConnection):
         sys.exit(1)
     print("\nStarting file processing...")
 
+    # Use the chunked NDJSON format when the directory has a manifest
+    manifest = read_manifest(json_directory)
+    if manifest:
+        process_chunked_files(
+            json_directory,
+            manifest,
+            lambda rows, source: create_table_from_json(rows, sanitize_table_name(source), connection),
+            workers=workers
+        )
+        return
+
     # Get sorted JSON files
     json_files = sorted(
         [f for f in os.listdir(json_directory) if f.endswith('.json')],
@@ -267,9 +282,17 @@ def main():
         action='store_true',
         help='Only run connection test without processing files'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Processes used to parse a chunked NDJSON dataset (default: CPU count)'
+    )
 
     args = parser.parse_args()
 
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be a positive integer")
+
     # Get token from args or environment
     token = args.token or os.environ.get('DATABRICKS_TOKEN')
     if not token:
@@ -294,7 +317,7 @@ def main():
                 print("\nConnection test successful! Use without --test-only to process files.")
             sys.exit(0)
 
-        process_json_files(args.json_directory, connection)
+        process_json_files(args.json_directory, connection, args.workers)
 
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,242 @@
+import json
+import os
+import re
+import argparse
+import sqlite3
+import sys
+import time
+
+# The chunked NDJSON reader is shared with relational/scripts/chunk_dataset.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'relational', 'scripts'))
+from chunked_dataset import read_manifest, process_chunked_files
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCHEMA_PATH = os.path.join(SCRIPT_DIR, '..', 'postgres', 'chinook-postgres.sql')
+
+# Statements of the Postgres script that DuckDB or SQLite reject, or that only slow down loading
+SKIPPED_STATEMENTS = re.compile(
+    r'^(COMMENT ON\b|ALTER TABLE\b.*\bFOREIGN KEY\b|CREATE INDEX "IFK_)',
+    re.IGNORECASE | re.DOTALL
+)
+
+def sanitize_table_name(filename):
+    """Convert filename to valid table name."""
+    # Remove the numeric prefix and file extension
+    table_name = filename.split('_', 1)[1] if '_' in filename else filename
+    table_name = os.path.splitext(table_name)[0]
+
+    # Replace any non-alphanumeric characters with underscore
+    table_name = re.sub(r'\W+', '_', table_name)
+
+    # Ensure name starts with letter
+    if not table_name[0].isalpha():
+        table_name = 'table_' + table_name
+
+    return table_name
+
+def connect(engine, database_path):
+    """Open an in-process DuckDB or SQLite database."""
+    if engine == 'duckdb':
+        try:
+            import duckdb
+        except ImportError:
+            print("Error: duckdb is not installed, run 'pip install duckdb' or use --engine sqlite")
+            sys.exit(1)
+        return duckdb.connect(database_path)
+
+    return sqlite3.connect(database_path)
+
+def create_schema(connection, schema_path):
+    """Create the Chinook tables from the Postgres script, so both backends share one schema."""
+    with open(schema_path, 'r') as file:
+        schema = file.read()
+
+    # Strip the block comments, then run one statement at a time as SQLite's execute() only accepts one
+    schema = re.sub(r'/\*.*?\*/', '', schema, flags=re.DOTALL)
+    for statement in schema.split(';'):
+        statement = statement.strip()
+        if statement and not SKIPPED_STATEMENTS.match(statement):
+            connection.execute(statement)
+
+def table_exists(connection, table_name):
+    """Check whether a table exists in the embedded database."""
+    if isinstance(connection, sqlite3.Connection):
+        query = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?"
+    else:
+        query = "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?"
+    return connection.execute(query, [table_name]).fetchone()[0] > 0
+
+def load_duckdb_table(connection, file_path, table_name):
+    """Bulk load a JSON array file with DuckDB's native columnar JSON reader."""
+    escaped_path = file_path.replace("'", "''")
+    connection.execute(
+        f'INSERT INTO "{table_name}" BY NAME '
+        f"SELECT * FROM read_json('{escaped_path}', format = 'array')"
+    )
+
+def insert_sqlite_rows(connection, rows, table_name):
+    """Insert a list of row objects into SQLite with a single executemany."""
+    if not rows:
+        return
+
+    columns = list(rows[0])
+    column_list = ', '.join(f'"{column}"' for column in columns)
+    placeholders = ', '.join('?' for _ in columns)
+    connection.executemany(
+        f'INSERT INTO "{table_name}" ({column_list}) VALUES ({placeholders})',
+        [tuple(row.get(column) for column in columns) for row in rows]
+    )
+
+def load_sqlite_table(connection, file_path, table_name):
+    """Load a JSON array file into SQLite."""
+    with open(file_path, 'r') as file:
+        json_data = json.load(file)
+
+    # Handle both single objects and arrays of objects
+    if isinstance(json_data, dict):
+        json_data = [json_data]
+
+    insert_sqlite_rows(connection, json_data, table_name)
+
+def load_duckdb_chunked_files(json_directory, manifest, connection):
+    """Bulk load a chunked NDJSON dataset with DuckDB's native reader.
+
+    The chunks of a table form one valid multi-member file, and DuckDB already parses it
+    in parallel, so there is no need for a separate process pool."""
+    print(f"Found {len(manifest['tables'])} chunked NDJSON tables to process")
+
+    for table in manifest['tables']:
+        table_name = sanitize_table_name(table['source'])
+        escaped_path = os.path.abspath(os.path.join(json_directory, table['path'])).replace("'", "''")
+        row_count = connection.execute(
+            f'INSERT INTO "{table_name}" BY NAME '
+            f"SELECT * FROM read_json('{escaped_path}', format = 'newline_delimited', "
+            f"compression = '{manifest['compression']}')"
+        ).fetchone()[0]
+
+        if row_count != table['rows']:
+            print(f"Error: Loaded {row_count} rows into {table_name}, expected {table['rows']}")
+            sys.exit(1)
+        print(f"Successfully populated table: {table_name} ({row_count} rows)")
+
+def process_json_files(json_directory, connection, engine, workers=None):
+    """Process all JSON files in the specified directory."""
+    if not os.path.exists(json_directory):
+        print(f"Error: Directory '{json_directory}' does not exist")
+        sys.exit(1)
+
+    if not os.path.isdir(json_directory):
+        print(f"Error: '{json_directory}' is not a directory")
+        sys.exit(1)
+
+    # Use the chunked NDJSON format when the directory has a manifest
+    manifest = read_manifest(json_directory)
+    if manifest:
+        start_time = time.perf_counter()
+        if engine == 'duckdb':
+            load_duckdb_chunked_files(json_directory, manifest, connection)
+        else:
+            process_chunked_files(
+                json_directory,
+                manifest,
+                lambda rows, source: insert_sqlite_rows(connection, rows, sanitize_table_name(source)),
+                workers=workers
+            )
+        connection.commit()
+        print(f"Loaded {len(manifest['tables'])} tables in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        return
+
+    # Count JSON files
+    json_files = sorted([f for f in os.listdir(json_directory) if f.endswith('.json')],
+                   key=lambda x: int(x.split('_')[0]))
+
+    if not json_files:
+        print(f"No JSON files found in '{json_directory}'")
+        sys.exit(1)
+
+    print(f"Found {len(json_files)} JSON files to process")
+
+    load_table = load_duckdb_table if engine == 'duckdb' else load_sqlite_table
+
+    # Process each JSON file in the directory
+    start_time = time.perf_counter()
+    for filename in json_files:
+        file_path = os.path.abspath(os.path.join(json_directory, filename))
+        table_name = sanitize_table_name(filename)
+
+        if not table_exists(connection, table_name):
+            print(f"Error: Table '{table_name}' does not exist")
+            sys.exit(1)
+
+        try:
+            table_start_time = time.perf_counter()
+            load_table(connection, file_path, table_name)
+            row_count = connection.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()[0]
+            elapsed_ms = (time.perf_counter() - table_start_time) * 1000
+            print(f"Successfully populated table: {table_name} ({row_count} rows in {elapsed_ms:.1f} ms)")
+        except json.JSONDecodeError as e:
+            print(f"Error reading JSON file {filename}: {str(e)}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error processing file {filename}: {str(e)}")
+            sys.exit(1)
+
+    connection.commit()
+    print(f"Loaded {len(json_files)} tables in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+def main():
+    # Set up argument parser
+    parser = argparse.ArgumentParser(
+        description='Create the Chinook schema in an embedded DuckDB or SQLite database and import JSON files into it'
+    )
+    parser.add_argument(
+        'json_directory',
+        help='Directory containing JSON files to import'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['duckdb', 'sqlite'],
+        default='duckdb',
+        help='Embedded database engine (default: duckdb)'
+    )
+    parser.add_argument(
+        '--database',
+        default=':memory:',
+        help='Database file to create, e.g. chinook.duckdb (default: :memory:)'
+    )
+    parser.add_argument(
+        '--schema',
+        default=DEFAULT_SCHEMA_PATH,
+        help='SQL script creating the tables (default: ../postgres/chinook-postgres.sql)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Processes used to parse a chunked NDJSON dataset with SQLite (default: CPU count)'
+    )
+    parser.add_argument(
+        '--replace',
+        action='store_true',
+        help='Delete an existing database file before loading'
+    )
+
+    args = parser.parse_args()
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be a positive integer")
+
+    if args.database != ':memory:' and os.path.exists(args.database):
+        if not args.replace:
+            print(f"Error: Database '{args.database}' already exists, use --replace to recreate it")
+            sys.exit(1)
+        os.remove(args.database)
+
+    connection = connect(args.engine, args.database)
+    try:
+        create_schema(connection, args.schema)
+        process_json_files(args.json_directory, connection, args.engine, args.workers)
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ import argparse
 import sys
 import urllib.parse
 
+# The chunked NDJSON reader is shared with relational/scripts/chunk_dataset.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'relational', 'scripts'))
+from chunked_dataset import read_manifest, process_chunked_files
+
 def sanitize_table_name(filename):
     """Convert filename to valid SQL Server table name."""
     # Remove the numeric prefix and file extension
@@ -49,7 +53,18 @@ def create_table_from_json(json_data, table_name, engine):
     except Exception as e:
         print(f"Error creating table {table_name}: {str(e)}")
 
-def process_json_files(json_directory, db_params):
+def check_row_count(table_name, expected_rows, engine):
+    """Fail if a table does not hold the number of rows listed in the manifest."""
+    # create_table_from_json reports insert errors without stopping, so a failed chunk
+    # would otherwise leave a partially loaded table behind
+    with engine.connect() as conn:
+        row_count = conn.execute(text(f'SELECT COUNT(*) FROM dbo.[{table_name}]')).scalar()
+
+    if row_count != expected_rows:
+        print(f"Error: Table '{table_name}' has {row_count} rows, expected {expected_rows}")
+        sys.exit(1)
+
+def process_json_files(json_directory, db_params, workers=None):
     """Process all JSON files in the specified directory."""
     if not os.path.exists(json_directory):
         print(f"Error: Directory '{json_directory}' does not exist")
@@ -71,6 +86,18 @@ def process_json_files(json_directory, db_params):
     # Create SQLAlchemy engine
     engine = create_engine(conn_str)
 
+    # Use the chunked NDJSON format when the directory has a manifest
+    manifest = read_manifest(json_directory)
+    if manifest:
+        process_chunked_files(
+            json_directory,
+            manifest,
+            lambda rows, source: create_table_from_json(rows, sanitize_table_name(source), engine),
+            lambda source, rows: check_row_count(sanitize_table_name(source), rows, engine),
+            workers=workers
+        )
+        return
+
     # Count JSON files
     json_files = sorted([f for f in os.listdir(json_directory) if f.endswith('.json')],
                        key=lambda x: int(x.split('_')[0]))
@@ -138,9 +165,17 @@ def main():
         required=True,
         help='SQL Server password'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Processes used to parse a chunked NDJSON dataset (default: CPU count)'
+    )
 
     args = parser.parse_args()
 
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be a positive integer")
+
     # Database connection parameters
     db_params = {
         'host': args.host,
@@ -150,7 +185,7 @@ def main():
         'port': args.port
     }
 
-    process_json_files(args.json_directory, db_params)
+    process_json_files(args.json_directory, db_params, args.workers)
 
 if __name__ == "__main__":
     main()